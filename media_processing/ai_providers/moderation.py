@@ -8,6 +8,8 @@ If that fails or key is missing, falls back to a basic regex/keyword filter for
 """
 
 from django.conf import settings
+from django.core.cache import cache
+import hashlib
 import re
 import logging
 from pathlib import Path
@@ -15,6 +17,9 @@ import unicodedata
 
 logger = logging.getLogger(__name__)
 
+# How long moderation verdicts stay cached (seconds)
+MODERATION_CACHE_TTL = 3600
+
 try:
     import google.generativeai as genai
 except Exception:
@@ -247,3 +252,98 @@ def moderate_text(text: str) -> dict:
 
     # Local fallback
     return _local_check(text)
+
+
+def moderate_text_cached(text: str) -> dict:
+    """Moderate text, caching verdicts by content hash.
+
+    Moderation is a deterministic function of the text, so identical
+    submissions (popular comments, re-posts) can reuse the stored verdict
+    instead of re-running the model or the regex pipeline. Keys use blake2b,
+    which is cheaper than sha256 on CPython.
+    """
+    text = (text or '').strip()
+    if not text:
+        return {'allowed': True, 'blocked': False, 'reasons': []}
+
+    key = 'mod:' + hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    result = cache.get(key)
+    if result is None:
+        result = moderate_text(text)
+        cache.set(key, result, MODERATION_CACHE_TTL)
+    return result
+
+
+def _gemini_moderate_batch(texts):
+    """Classify several texts in one Gemini round-trip.
+
+    Returns a list of verdict dicts in input order, or None if the provider
+    is unavailable or the response cannot be interpreted.
+    """
+    api_key = getattr(settings, 'GEMINI_API_KEY', '')
+    if not (api_key and genai and hasattr(genai, 'predict')):
+        return None
+
+    try:
+        genai.configure(api_key=api_key)
+        numbered = '\n'.join(f"{i}: '''{t}'''" for i, t in enumerate(texts))
+        prompt = (
+            "Classify the following user comments for moderation.\n"
+            "Respond only with a JSON array, one object per comment in the same order,\n"
+            "each with fields: blocked (true/false) and reasons (list).\n"
+            "Reasons should be values like 'profanity','sexual_content','violence','self_harm','link','spam'.\n"
+            f"Comments:\n{numbered}\n"
+        )
+        resp = genai.predict(model='text-bison-001', input=prompt)
+        out = getattr(resp, 'text', None) or str(resp)
+
+        import json
+        m = re.search(r'\[.*\]', out, re.S)
+        if not m:
+            return None
+        parsed = json.loads(m.group(0))
+        if not isinstance(parsed, list) or len(parsed) != len(texts):
+            return None
+        return [
+            {
+                'allowed': not bool(p.get('blocked')),
+                'blocked': bool(p.get('blocked')),
+                'reasons': p.get('reasons', []) or [],
+            }
+            for p in parsed
+        ]
+    except Exception:
+        logger.exception('Gemini batch moderation failed, falling back to local filter')
+        return None
+
+
+def moderate_text_batch(texts) -> list:
+    """Moderate several texts with at most one provider round-trip.
+
+    Cached and empty texts are answered immediately; the remainder go to the
+    provider as a single batched call (falling back to the local filter per
+    text). Returns verdicts in input order and caches them like
+    `moderate_text_cached`.
+    """
+    results = [None] * len(texts)
+    pending = []  # (input index, stripped text, cache key)
+    for i, raw in enumerate(texts):
+        text = (raw or '').strip()
+        if not text:
+            results[i] = {'allowed': True, 'blocked': False, 'reasons': []}
+            continue
+        key = 'mod:' + hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        cached = cache.get(key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, text, key))
+
+    if pending:
+        verdicts = _gemini_moderate_batch([t for _, t, _ in pending])
+        for slot, (i, text, key) in enumerate(pending):
+            result = verdicts[slot] if verdicts else _local_check(text)
+            cache.set(key, result, MODERATION_CACHE_TTL)
+            results[i] = result
+
+    return results
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-08-30 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_processing', '0005_artwork_ai_caption_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='cloudinary_task_id',
+            field=models.CharField(blank=True, help_text='Celery task id of the background Cloudinary upload', max_length=255),
+        ),
+    ]
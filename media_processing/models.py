@@ -69,6 +69,7 @@ class Artwork(models.Model):
     generation_started_at = models.DateTimeField(null=True, blank=True)
     generation_completed_at = models.DateTimeField(null=True, blank=True)
     celery_task_id = models.CharField(max_length=255, blank=True)
+    cloudinary_task_id = models.CharField(max_length=255, blank=True, help_text="Celery task id of the background Cloudinary upload")
     error_message = models.TextField(blank=True)
 
     # Social features
@@ -414,6 +414,42 @@ def optimize_image(artwork_id):
         return {'status': 'error', 'message': str(e)}
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def upload_artwork_to_cloudinary(self, artwork_id):
+    """
+    Upload an artwork's image to Cloudinary in the background
+
+    Args:
+        artwork_id: UUID of artwork whose image should be uploaded
+
+    Writes the resulting URL to artwork.cloudinary_url; clients poll the
+    artwork until it is populated.
+    """
+    from .utils.cloudinary_helper import upload_to_cloudinary
+
+    try:
+        artwork = Artwork.objects.get(id=artwork_id)
+    except Artwork.DoesNotExist:
+        return {'status': 'error', 'message': 'Artwork not found'}
+
+    if not artwork.image:
+        return {'status': 'error', 'message': 'No image to upload'}
+
+    try:
+        cloudinary_url = upload_to_cloudinary(artwork.image.path)
+        if not cloudinary_url:
+            raise ValueError('Cloudinary upload returned no URL')
+    except Exception as e:
+        logger.error(f"Error uploading artwork {artwork_id} to Cloudinary: {str(e)}")
+        raise self.retry(exc=e)
+
+    artwork.cloudinary_url = cloudinary_url
+    artwork.save(update_fields=['cloudinary_url'])
+
+    logger.info(f"Uploaded artwork {artwork_id} to Cloudinary")
+    return {'status': 'success', 'cloudinary_url': cloudinary_url}
+
+
 @shared_task(bind=True, max_retries=2, default_retry_delay=60)
 def generate_artwork_caption(self, artwork_id):
     """
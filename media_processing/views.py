@@ -3,23 +3,30 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
 from rest_framework.views import APIView
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Greatest
 from django_filters.rest_framework import DjangoFilterBackend
+import hashlib
+import json
+import logging
 import os
+import uuid
 
-from .models import Artwork, Tag, Collection, Comment
+from .models import Artwork, ArtworkLike, Tag, Collection, Comment
 from .serializers import (
     ArtworkSerializer, ArtworkCreateSerializer,
     TagSerializer, CollectionSerializer, CollectionCreateSerializer,
     CommentSerializer
 )
+from .tasks import (
+    generate_artwork, generate_artwork_caption, upload_artwork_to_cloudinary
+)
 from .utils.algorithmic_art import PATTERN_CATALOG
-from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
-from .ai_providers.moderation import moderate_text
-from rest_framework import status
-from rest_framework.response import Response
+from .ai_providers.moderation import moderate_text_batch, moderate_text_cached
+
+logger = logging.getLogger(__name__)
 
 
 class ArtworkViewSet(viewsets.ModelViewSet):
@@ -28,7 +35,8 @@ class ArtworkViewSet(viewsets.ModelViewSet):
     List, create, retrieve, update, delete artworks
     NO AUTH REQUIRED - For testing image generation
     """
-    queryset = Artwork.objects.all()
+    # No class-level queryset: get_queryset() is the single source of truth so
+    # actions can't accidentally bypass its joins/prefetches via self.queryset.
     # permission_classes = [IsAuthenticatedOrReadOnly]  # DISABLED - No auth needed for testing
     permission_classes = [AllowAny]  # Allow anonymous artwork generation
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -44,7 +52,12 @@ class ArtworkViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter queryset based on user permissions"""
-        queryset = Artwork.objects.all()
+        # Join the author and prefetch tags/comments up front; the serializer
+        # touches user, artwork_tags.tag and comments.count() per row, which
+        # otherwise fires N+1 queries on every list page.
+        queryset = Artwork.objects.select_related('user').prefetch_related(
+            'artwork_tags__tag', 'comments'
+        )
 
         # Non-authenticated users see only public artworks
         if not self.request.user.is_authenticated:
@@ -61,67 +74,105 @@ class ArtworkViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Create artwork and trigger generation task"""
         # Allow anonymous artwork generation - user is optional
-        if self.request.user.is_authenticated:
-            artwork = serializer.save(user=self.request.user)
-        else:
-            artwork = serializer.save(user=None)
-
-        # Trigger Celery task for async generation
-        from .tasks import generate_artwork
-        task = generate_artwork.delay(str(artwork.id))
-        artwork.celery_task_id = task.id
-        artwork.save(update_fields=['celery_task_id'])
+        user = self.request.user if self.request.user.is_authenticated else None
+
+        # Pre-generate the Celery task id so the row is written in a single
+        # INSERT instead of INSERT + UPDATE, and dispatch only after commit
+        # so the worker never races a row it can't see yet.
+        task_id = str(uuid.uuid4())
+        with transaction.atomic():
+            artwork = serializer.save(user=user, celery_task_id=task_id)
+            transaction.on_commit(
+                lambda: generate_artwork.apply_async(args=[str(artwork.id)], task_id=task_id)
+            )
 
         return artwork
 
     def perform_destroy(self, instance):
         """Delete artwork and its image file from filesystem"""
-        # Delete image file if it exists
+        # Unlink directly (EAFP) instead of stat-then-remove: one syscall,
+        # and no race with a file disappearing between the two calls.
         if instance.image:
-            try:
-                if os.path.isfile(instance.image.path):
-                    os.remove(instance.image.path)
-                    print(f"Deleted image file: {instance.image.path}")
-            except Exception as e:
-                print(f"Error deleting image file: {e}")
-        
+            self._unlink_image_file(instance.image.path)
+
         # Delete the database record
         instance.delete()
 
+    @staticmethod
+    def _unlink_image_file(path):
+        """Remove an image file, tolerating it already being gone."""
+        try:
+            os.unlink(path)
+            logger.info("Deleted image file: %s", path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Error deleting image file %s: %s", path, e)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def bulk_delete(self, request):
+        """Delete several of the caller's artworks in one request"""
+        ids = request.data.get('ids', [])
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {'error': 'Provide a non-empty "ids" list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        owned = Artwork.objects.filter(id__in=ids, user=request.user)
+
+        # Gather file paths first, then drop all rows in one DELETE.
+        image_names = list(owned.exclude(image='').values_list('image', flat=True))
+        _, deleted_by_model = owned.delete()
+        deleted_count = deleted_by_model.get('media_processing.Artwork', 0)
+
+        for name in image_names:
+            self._unlink_image_file(os.path.join(settings.MEDIA_ROOT, name))
+
+        return Response({'status': 'deleted', 'count': deleted_count})
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def like(self, request, pk=None):
         """Like an artwork"""
-        artwork = self.get_object()
         user = request.user
 
-        # Toggle like: if already liked by user, remove it (unlike), else create like
-        from .models import ArtworkLike
-
-        liked = ArtworkLike.objects.filter(user=user, artwork=artwork).first()
-        if liked:
-            liked.delete()
-            # Decrement likes_count safely
-            if artwork.likes_count > 0:
-                artwork.likes_count -= 1
-                artwork.save(update_fields=['likes_count'])
-            return Response({'status': 'unliked', 'likes_count': artwork.likes_count})
+        # The toggle only needs the artwork id; check existence with an
+        # index-only scan instead of get_object()'s full-row SELECT.
+        if not Artwork.objects.filter(pk=pk).exists():
+            return Response({'error': 'Artwork not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Toggle like: if already liked by user, remove it (unlike), else create like.
+        # The counter moves via an F() expression so concurrent likes hit a single
+        # atomic UPDATE instead of a racy read-modify-write; the unique
+        # (user, artwork) constraint behind get_or_create stops double-likes.
+        with transaction.atomic():
+            like, created = ArtworkLike.objects.get_or_create(user=user, artwork_id=pk)
+            if created:
+                Artwork.objects.filter(pk=pk).update(
+                    likes_count=models.F('likes_count') + 1
+                )
+                action_taken = 'liked'
+            else:
+                like.delete()
+                Artwork.objects.filter(pk=pk).update(
+                    likes_count=Greatest(models.F('likes_count') - 1, 0)
+                )
+                action_taken = 'unliked'
 
-        ArtworkLike.objects.create(user=user, artwork=artwork)
-        artwork.likes_count += 1
-        artwork.save(update_fields=['likes_count'])
-        return Response({'status': 'liked', 'likes_count': artwork.likes_count})
+        likes_count = Artwork.objects.values_list('likes_count', flat=True).get(pk=pk)
+        return Response({'status': action_taken, 'likes_count': likes_count})
 
     @action(detail=True, methods=['get', 'post'], permission_classes=[IsAuthenticatedOrReadOnly])
     def comments(self, request, pk=None):
         """List or create comments for an artwork"""
         artwork = self.get_object()
-        from .models import Comment
-        from .serializers import CommentSerializer
-        # moderation helper
-        from .ai_providers.moderation import moderate_text
 
         if request.method == 'GET':
-            comments = artwork.comments.all().select_related('user')
+            comments = artwork.comments.all().select_related('user').only(
+                'id', 'artwork_id', 'content', 'created_at', 'updated_at',
+                'user__id', 'user__username', 'user__email',
+                'user__first_name', 'user__last_name', 'user__date_joined'
+            )
             serializer = CommentSerializer(comments, many=True, context={'request': request})
             return Response(serializer.data)
 
@@ -131,7 +182,7 @@ class ArtworkViewSet(viewsets.ModelViewSet):
 
         # Run moderation on incoming content before validation/save
         content = request.data.get('content', '')
-        mod = moderate_text(content)
+        mod = moderate_text_cached(content)
         if mod.get('blocked'):
             return Response({'error': 'Comment blocked by moderation', 'reasons': mod.get('reasons', [])}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -144,14 +195,34 @@ class ArtworkViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def status(self, request, pk=None):
         """Get generation status of artwork"""
-        artwork = self.get_object()
-        
-        # Build full URL for image
+        # Fetch only the columns the poll response needs; skip the list
+        # queryset's joins/prefetches and wide row (prompt, params, captions).
+        queryset = Artwork.objects.only(
+            'id', 'status', 'generation_started_at', 'generation_completed_at',
+            'error_message', 'image', 'updated_at'
+        )
+        if not request.user.is_authenticated:
+            queryset = queryset.filter(is_public=True)
+        artwork = get_object_or_404(queryset, pk=pk)
+
+        # The frontend polls this endpoint during generation. The payload only
+        # changes when the status does, so answer repeat polls with an empty
+        # 304 instead of rebuilding the body every time.
+        etag = '"%s"' % hashlib.md5(
+            f"{artwork.id}:{artwork.status}:{artwork.generation_completed_at}".encode()
+        ).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+
+        # Build full URL for image with a plain concat; build_absolute_uri
+        # reconstructs the URL from the WSGI environ on every poll.
         image_url = None
         if artwork.image:
-            image_url = request.build_absolute_uri(artwork.image.url)
-        
-        return Response({
+            image_url = f"{request.scheme}://{request.get_host()}{artwork.image.url}"
+
+        response = Response({
             'id': str(artwork.id),
             'status': artwork.status,
             'generation_started_at': artwork.generation_started_at,
@@ -160,11 +231,20 @@ class ArtworkViewSet(viewsets.ModelViewSet):
             'error_message': artwork.error_message,
             'image_url': image_url
         })
+        response['ETag'] = etag
+        response['Last-Modified'] = artwork.updated_at.strftime('%a, %d %b %Y %H:%M:%S GMT')
+        return response
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_artworks(self, request):
-        """Get current user's artworks"""
-        artworks = self.queryset.filter(user=request.user)
+        """Get current user's artworks (paginated)"""
+        artworks = self.filter_queryset(self.get_queryset().filter(user=request.user))
+
+        page = self.paginate_queryset(artworks)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(artworks, many=True)
         return Response(serializer.data)
 
@@ -179,33 +259,25 @@ class ArtworkViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Upload to Cloudinary
-        from .utils.cloudinary_helper import upload_to_cloudinary
+        if artwork.cloudinary_url:
+            return Response({
+                'status': 'saved',
+                'cloudinary_url': artwork.cloudinary_url,
+                'message': 'Image already saved to Cloudinary.'
+            })
 
-        try:
-            cloudinary_url = upload_to_cloudinary(artwork.image.path)
-
-            if cloudinary_url:
-                # Save Cloudinary URL to dedicated field
-                artwork.cloudinary_url = cloudinary_url
-                artwork.save(update_fields=['cloudinary_url'])
-
-                return Response({
-                    'status': 'saved',
-                    'cloudinary_url': cloudinary_url,
-                    'message': 'Image saved to Cloudinary successfully!'
-                })
-            else:
-                return Response(
-                    {'error': 'Failed to upload to Cloudinary'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        # Upload happens in a Celery worker; blocking the web worker on a
+        # WAN upload ties up a serving slot for seconds per request.
+        task = upload_artwork_to_cloudinary.delay(str(artwork.id))
+        artwork.cloudinary_task_id = task.id
+        artwork.save(update_fields=['cloudinary_task_id'])
 
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response({
+            'status': 'queued',
+            'task_id': task.id,
+            'artwork_id': str(artwork.id),
+            'message': 'Upload started. Poll the artwork until cloudinary_url is set.'
+        }, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=True, methods=['post'], permission_classes=[AllowAny])
     def generate_caption(self, request, pk=None):
@@ -236,7 +308,6 @@ class ArtworkViewSet(viewsets.ModelViewSet):
             })
         
         # Trigger Celery task
-        from .tasks import generate_artwork_caption
         task = generate_artwork_caption.delay(str(artwork.id))
         
         return Response({
@@ -295,8 +366,11 @@ class CollectionViewSet(viewsets.ModelViewSet):
             )
 
         artwork_id = request.data.get('artwork_id')
-        artwork = get_object_or_404(Artwork, id=artwork_id, user=request.user)
-        collection.artworks.add(artwork)
+        # M2M add accepts raw ids; validate existence with an index-only
+        # scan rather than fetching the full row.
+        if not Artwork.objects.filter(id=artwork_id, user=request.user).exists():
+            return Response({'error': 'Artwork not found'}, status=status.HTTP_404_NOT_FOUND)
+        collection.artworks.add(artwork_id)
 
         return Response({'status': 'artwork added'})
 
@@ -312,46 +386,67 @@ class CollectionViewSet(viewsets.ModelViewSet):
             )
 
         artwork_id = request.data.get('artwork_id')
-        artwork = get_object_or_404(Artwork, id=artwork_id)
-        collection.artworks.remove(artwork)
+        if not Artwork.objects.filter(id=artwork_id).exists():
+            return Response({'error': 'Artwork not found'}, status=status.HTTP_404_NOT_FOUND)
+        collection.artworks.remove(artwork_id)
 
         return Response({'status': 'artwork removed'})
 
 
+# PATTERN_CATALOG is a module-level constant, so its ETag never changes for
+# the lifetime of the process; compute it once at import.
+_CATALOG_ETAG = '"%s"' % hashlib.md5(
+    json.dumps(PATTERN_CATALOG, sort_keys=True, default=str).encode()
+).hexdigest()
+
+
+def _build_patterns_payload():
+    """Group the static pattern catalog by category, once at import."""
+    patterns_by_category = {}
+    for pattern_id, pattern_info in PATTERN_CATALOG.items():
+        category = pattern_info['category']
+
+        if category not in patterns_by_category:
+            patterns_by_category[category] = []
+
+        patterns_by_category[category].append({
+            'id': pattern_id,
+            'name': pattern_info['name'],
+            'description': pattern_info['description'],
+            'params': pattern_info['params']
+        })
+
+    return {
+        'patterns': PATTERN_CATALOG,
+        'patterns_by_category': patterns_by_category,
+        'categories': list(patterns_by_category.keys()),
+        'total_patterns': len(PATTERN_CATALOG)
+    }
+
+
+_PATTERNS_PAYLOAD = _build_patterns_payload()
+
+
 class AlgorithmicPatternsView(APIView):
     """
     View to list available algorithmic art patterns
     No authentication required
     """
     permission_classes = [AllowAny]
-    
+
     def get(self, request):
         """
         Return catalog of available algorithmic art patterns
         with their metadata, parameters, and categories
         """
-        # Organize by category
-        patterns_by_category = {}
-        
-        for pattern_id, pattern_info in PATTERN_CATALOG.items():
-            category = pattern_info['category']
-            
-            if category not in patterns_by_category:
-                patterns_by_category[category] = []
-            
-            patterns_by_category[category].append({
-                'id': pattern_id,
-                'name': pattern_info['name'],
-                'description': pattern_info['description'],
-                'params': pattern_info['params']
-            })
-        
-        return Response({
-            'patterns': PATTERN_CATALOG,
-            'patterns_by_category': patterns_by_category,
-            'categories': list(patterns_by_category.keys()),
-            'total_patterns': len(PATTERN_CATALOG)
-        })
+        if request.headers.get('If-None-Match') == _CATALOG_ETAG:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = _CATALOG_ETAG
+            return response
+
+        response = Response(_PATTERNS_PAYLOAD)
+        response['ETag'] = _CATALOG_ETAG
+        return response
 
 
 
@@ -360,12 +455,20 @@ class ModerationView(APIView):
 
     POST /api/moderate/ with JSON {"content": "..."}
     Returns { allowed: bool, blocked: bool, reasons: [...] }
+
+    Also accepts {"content": ["...", ...]} and returns {"results": [...]}
+    with one verdict per entry, moderated in a single provider call.
     """
     permission_classes = [AllowAny]
 
     def post(self, request):
         content = request.data.get('content', '')
-        result = moderate_text(content)
+        if isinstance(content, list):
+            return Response(
+                {'results': moderate_text_batch(content)},
+                status=status.HTTP_200_OK
+            )
+        result = moderate_text_cached(content)
         # Return 200 with moderation result; client can decide how to act
         return Response(result, status=status.HTTP_200_OK)
 
@@ -402,8 +505,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         
         # Run moderation on updated content
         content = request.data.get('content', '')
-        from .ai_providers.moderation import moderate_text
-        mod = moderate_text(content)
+        mod = moderate_text_cached(content)
         if mod.get('blocked'):
             return Response(
                 {'error': 'Comment blocked by moderation', 'reasons': mod.get('reasons', [])},
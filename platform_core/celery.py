@@ -27,24 +27,44 @@ app.conf.update(
     broker_url=config('CELERY_BROKER_URL', default='redis://localhost:6379/0'),
     result_backend=config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0'),
 
-    # Task serialization
-    task_serializer='json',
-    result_serializer='json',
-    accept_content=['json'],
+    # Task serialization: msgpack is smaller and faster to encode/decode than
+    # JSON for the UUID/status payloads we push through Redis. json stays in
+    # accept_content so messages queued by older deploys still drain.
+    task_serializer='msgpack',
+    result_serializer='msgpack',
+    accept_content=['json', 'msgpack'],
+    result_accept_content=['json', 'msgpack'],
     timezone='UTC',
     enable_utc=True,
 
     # Task result expiration (7 days)
     result_expires=604800,
 
-    # Task routing - DISABLED for now, use default 'celery' queue
-    # task_routes={
-    #     'media_processing.tasks.*': {'queue': 'generation'},
-    # },
+    # Task routing - split queues by cost class so a 10-minute image
+    # generation never head-of-line-blocks quick caption or cleanup work.
+    # Unrouted tasks still land on the default 'celery' queue.
+    task_routes={
+        # Long, API/GPU-bound image generation
+        'media_processing.tasks.generate_artwork': {'queue': 'generation'},
+        'media_processing.tasks.generate_avatar_for_user': {'queue': 'generation'},
+        # Quick text-model calls (captions, bios, skill analysis)
+        'media_processing.tasks.generate_artwork_caption': {'queue': 'fast'},
+        'media_processing.tasks.generate_profile_bio': {'queue': 'fast'},
+        'media_processing.tasks.generate_artist_personality': {'queue': 'fast'},
+        'media_processing.tasks.analyze_skill_progression': {'queue': 'fast'},
+        # Disk / network I/O
+        'media_processing.tasks.upload_artwork_to_cloudinary': {'queue': 'io'},
+        'media_processing.tasks.optimize_image': {'queue': 'io'},
+        'media_processing.tasks.cleanup_failed_artworks': {'queue': 'io'},
+    },
 
-    # Worker configuration
+    # Worker configuration. These defaults suit the long-running generation
+    # workers; the fast queue overrides them per-worker with
+    # --prefetch-multiplier=4 --max-tasks-per-child=50 (see pre_flight_check
+    # start instructions), since sub-second tasks starve on prefetch=1 and
+    # leak-guard recycling is cheap there.
     worker_prefetch_multiplier=1,  # One task at a time per worker (for long-running AI tasks)
-    worker_max_tasks_per_child=50,  # Restart worker after 50 tasks (prevent memory leaks)
+    worker_max_tasks_per_child=200,  # Recycle workers occasionally (leak guard) without fork thrash
 
     # Task time limits (AI generation can take time)
     task_soft_time_limit=300,  # 5 minutes soft limit
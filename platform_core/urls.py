@@ -6,7 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from accounts import views as accounts_views
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from rest_framework.authtoken import views as authtoken_views
 
 # Import admin customization
@@ -17,8 +17,10 @@ from media_processing.views import ArtworkViewSet, TagViewSet, CollectionViewSet
 from accounts.views import UserProfileViewSet, ActivityLogViewSet
 from prompt_library.views import PromptTemplateViewSet, CategoryViewSet, TagViewSet as PromptTagViewSet, UserPromptLibraryViewSet
 
-# Create router for API endpoints
-router = DefaultRouter()
+# Create router for API endpoints. SimpleRouter skips DefaultRouter's API-root
+# view and the format-suffix patterns the SPA never calls, which keeps the URL
+# resolver table smaller.
+router = SimpleRouter()
 router.register(r'artworks', ArtworkViewSet, basename='artwork')
 router.register(r'tags', TagViewSet, basename='tag')
 router.register(r'collections', CollectionViewSet, basename='collection')
@@ -45,12 +45,20 @@ def check_env_file():
         'DB_NAME': 'Database Name',
     }
 
+    # Parse the file once into a dict instead of re-splitting the whole
+    # content for every required key.
+    env = {}
     with open(env_path, 'r') as f:
-        env_content = f.read()
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, _, value = line.partition('=')
+            env[key.strip()] = value.strip()
 
     all_good = True
     for key, name in required_keys.items():
-        if key in env_content and not env_content.split(key)[1].split('\n')[0].strip(' =').startswith('YOUR-'):
+        if key in env and env[key] and not env[key].startswith('YOUR-'):
             print(f"{GREEN}[OK]{RESET} {name}")
         else:
             print(f"{RED}[X]{RESET} {name} - Missing or not configured")
@@ -68,17 +76,9 @@ def check_redis():
 
         broker_url = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 
-        # Parse Redis URL
-        if '://:' in broker_url:  # Has password
-            password = broker_url.split('://')[1].split('@')[0].strip(':')
-            host_port = broker_url.split('@')[1].split('/')[0]
-            host = host_port.split(':')[0]
-            port = int(host_port.split(':')[1])
-            db = int(broker_url.split('/')[-1])
-
-            r = redis.Redis(host=host, port=port, db=db, password=password, socket_timeout=2)
-        else:
-            r = redis.from_url(broker_url, socket_timeout=2)
+        # redis-py understands password-bearing URLs natively; a short connect
+        # timeout makes DNS/connect failures report fast instead of hanging.
+        r = redis.Redis.from_url(broker_url, socket_connect_timeout=1, socket_timeout=1)
 
         r.ping()
         print(f"{GREEN}[OK] Redis is running and accessible{RESET}")
@@ -103,12 +103,20 @@ def check_database():
         os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'platform_core.settings')
         django.setup()
 
+        # ensure_connection() performs the TCP/auth handshake without the
+        # parse/plan roundtrip a dummy SELECT would add.
         from django.db import connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
+        connection.ensure_connection()
 
         print(f"{GREEN}[OK] Database is accessible{RESET}")
         print(f"  Database: {connection.settings_dict['NAME']}")
+
+        # Persistent connections matter under load; warn if they are disabled.
+        conn_max_age = connection.settings_dict.get('CONN_MAX_AGE') or 0
+        from django.conf import settings as django_settings
+        if conn_max_age == 0 and not django_settings.DEBUG:
+            print(f"{YELLOW}[!] CONN_MAX_AGE is 0 - every request opens a fresh DB connection.{RESET}")
+            print(f"  Set DJANGO_MAX_CONN_AGE (or deploy PgBouncer) for production.")
         return True
     except Exception as e:
         print(f"{RED}[X] Cannot connect to database{RESET}")
@@ -201,8 +209,12 @@ def print_start_instructions():
     print(f"{BLUE}{'='*60}{RESET}")
     print(f"{GREEN}START ALL SERVICES (3 separate terminals):{RESET}\n")
 
-    print(f"{YELLOW}Terminal 1 - Celery Worker:{RESET}")
-    print(f"  celery -A platform_core worker -l info -P solo\n")
+    print(f"{YELLOW}Terminal 1 - Celery Workers (one per queue):{RESET}")
+    print(f"  celery -A platform_core worker -l info -Q generation,celery --concurrency=2 -n generation@%h")
+    print(f"  celery -A platform_core worker -l info -Q fast --concurrency=16 --prefetch-multiplier=4 --max-tasks-per-child=50 -n fast@%h")
+    print(f"  celery -A platform_core worker -l info -Q io --concurrency=8 -n io@%h")
+    print(f"  (local dev shortcut, single worker for all queues:)")
+    print(f"  celery -A platform_core worker -l info -P solo -Q generation,fast,io,celery\n")
 
     print(f"{YELLOW}Terminal 2 - Django Backend:{RESET}")
     print(f"  python manage.py runserver\n")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from prompt_library.models import PromptTemplate
+
+
+class Command(BaseCommand):
+    help = 'Resync PromptTemplate.likes_count from favorited library rows in bulk'
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        # One annotated pass computes every prompt's true favorite count,
+        # and one bulk_update writes the drifted rows back — instead of a
+        # COUNT plus save per prompt.
+        annotated = PromptTemplate.objects.annotate(
+            real_likes=Count('saved_by', filter=Q(saved_by__is_favorite=True))
+        ).only('id', 'likes_count')
+
+        stale = []
+        for prompt in annotated.iterator():
+            if prompt.likes_count != prompt.real_likes:
+                prompt.likes_count = prompt.real_likes
+                stale.append(prompt)
+
+        if stale:
+            PromptTemplate.objects.bulk_update(stale, ['likes_count'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f'Resynced likes_count on {len(stale)} prompt(s)'))
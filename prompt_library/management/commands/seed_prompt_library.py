@@ -1,35 +1,48 @@
+from dataclasses import dataclass
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from prompt_library.models import Category, Tag, PromptTemplate
 import random
 
 
-SAMPLE = [
-    {
-        'title': 'Cyberpunk Portrait',
-        'prompt_text': 'A highly detailed cyberpunk portrait of a {subject}, neon lights, rain-soaked streets, cinematic lighting.',
-        'description': 'Creates stunning cyberpunk-style portraits',
-        'category': 'Portrait',
-        'tags': ['cyberpunk', 'neon', 'futuristic'],
-        'variables': ['subject']
-    },
-    {
-        'title': 'Dreamy Landscape',
-        'prompt_text': 'A dreamy, pastel-colored landscape with floating islands and soft fog, {mood}.',
-        'description': 'Soft, surreal landscapes for dreamy scenes',
-        'category': 'Landscape',
-        'tags': ['dreamy', 'pastel', 'surreal'],
-        'variables': ['mood']
-    },
-    {
-        'title': 'Fantasy Castle at Dusk',
-        'prompt_text': 'A majestic fantasy castle on a cliff during dusk, warm lights, {atmosphere}.',
-        'description': 'Epic fantasy architecture and scenic lighting',
-        'category': 'Fantasy',
-        'tags': ['fantasy', 'castle', 'epic'],
-        'variables': ['atmosphere']
-    },
-    # Add more sample entries programmatically below
-]
+@dataclass(frozen=True, slots=True)
+class Sample:
+    """One immutable seed record; attribute access beats dict hashing."""
+    title: str
+    prompt_text: str
+    description: str
+    category: str
+    tags: tuple
+    variables: tuple
+
+
+SAMPLE = (
+    Sample(
+        title='Cyberpunk Portrait',
+        prompt_text='A highly detailed cyberpunk portrait of a {subject}, neon lights, rain-soaked streets, cinematic lighting.',
+        description='Creates stunning cyberpunk-style portraits',
+        category='Portrait',
+        tags=('cyberpunk', 'neon', 'futuristic'),
+        variables=('subject',),
+    ),
+    Sample(
+        title='Dreamy Landscape',
+        prompt_text='A dreamy, pastel-colored landscape with floating islands and soft fog, {mood}.',
+        description='Soft, surreal landscapes for dreamy scenes',
+        category='Landscape',
+        tags=('dreamy', 'pastel', 'surreal'),
+        variables=('mood',),
+    ),
+    Sample(
+        title='Fantasy Castle at Dusk',
+        prompt_text='A majestic fantasy castle on a cliff during dusk, warm lights, {atmosphere}.',
+        description='Epic fantasy architecture and scenic lighting',
+        category='Fantasy',
+        tags=('fantasy', 'castle', 'epic'),
+        variables=('atmosphere',),
+    ),
+    # More sample entries are generated programmatically in handle() below
+)
 
 MORE_CATEGORIES = ['Portrait', 'Landscape', 'Abstract', 'Fantasy', 'Sci-Fi', 'Still Life']
 MORE_TAGS = ['minimal', 'vibrant', 'photorealistic', 'oil', 'watercolor', 'retro', 'cinematic', 'neon']
@@ -38,54 +51,86 @@ MORE_TAGS = ['minimal', 'vibrant', 'photorealistic', 'oil', 'watercolor', 'retro
 class Command(BaseCommand):
     help = 'Seed the prompt_library with sample categories, tags and prompt templates (20 items)'
 
+    @transaction.atomic
     def handle(self, *args, **options):
-        # Ensure categories
-        cat_objs = {}
-        for name in MORE_CATEGORIES:
-            obj, _ = Category.objects.get_or_create(name=name, slug=name.lower())
-            cat_objs[name] = obj
+        # Ensure categories and tags with one bulk insert each instead of a
+        # SELECT+INSERT round-trip per name, then fetch them back into maps.
+        Category.objects.bulk_create(
+            [Category(name=name, slug=name.lower()) for name in MORE_CATEGORIES],
+            ignore_conflicts=True
+        )
+        cat_objs = {c.name: c for c in Category.objects.filter(name__in=MORE_CATEGORIES)}
 
-        tag_objs = {}
-        for t in MORE_TAGS:
-            obj, _ = Tag.objects.get_or_create(name=t)
-            tag_objs[t] = obj
+        all_tag_names = set(MORE_TAGS) | {t for s in SAMPLE for t in s.tags}
+        Tag.objects.bulk_create(
+            [Tag(name=n) for n in all_tag_names],
+            ignore_conflicts=True
+        )
+        tag_objs = {t.name: t for t in Tag.objects.filter(name__in=all_tag_names)}
 
-        created = 0
+        # Describe all 20 desired templates up front (samples + generated),
+        # then insert only the missing ones in a single statement.
+        desired = [
+            {
+                'title': s.title,
+                'prompt_text': s.prompt_text,
+                'description': s.description,
+                'category': cat_objs.get(s.category),
+                'variables': list(s.variables),
+                'tags': list(s.tags),
+            }
+            for s in SAMPLE
+        ]
+        # Seeded RNG: the generated titles/tags come out identical on every
+        # run, so re-seeding is idempotent instead of minting new titles.
+        rng = random.Random(42)
+        needed = 20 - len(desired)
+        cats = rng.choices(MORE_CATEGORIES, k=needed)
+        styles = rng.choices(['detailed', 'minimal', 'stylized'], k=needed)
+        accents = rng.choices(MORE_TAGS, k=needed)
+        tag_pairs = [rng.sample(MORE_TAGS, k=2) for _ in range(needed)]
+        for i, cat in enumerate(cats):
+            desired.append({
+                'title': f"Sample Prompt {i+1} - {cat}",
+                'prompt_text': f"A {styles[i]} {cat.lower()} scene with {accents[i]}, mood: {{mood}}.",
+                'description': f'Auto-generated sample prompt for {cat}',
+                'category': cat_objs.get(cat),
+                'variables': ['mood'],
+                'tags': tag_pairs[i],
+            })
 
-        for s in SAMPLE:
-            cat = cat_objs.get(s['category'])
-            p, _ = PromptTemplate.objects.get_or_create(
-                title=s['title'],
-                defaults={
-                    'prompt_text': s['prompt_text'],
-                    'description': s['description'],
-                    'category': cat,
-                    'variables': s.get('variables', []),
-                    'is_public': True,
-                }
+        existing = set(
+            PromptTemplate.objects.filter(
+                title__in=[d['title'] for d in desired]
+            ).values_list('title', flat=True)
+        )
+        new_prompts = [
+            PromptTemplate(
+                title=d['title'],
+                prompt_text=d['prompt_text'],
+                description=d['description'],
+                category=d['category'],
+                variables=d['variables'],
+                # the bulk through-table insert below bypasses m2m_changed,
+                # so fill the denormalized column directly
+                tag_names=d['tags'],
+                is_public=True,
             )
-            for t in s['tags']:
-                tag, _ = Tag.objects.get_or_create(name=t)
-                p.tags.add(tag)
-            created += 1
+            for d in desired if d['title'] not in existing
+        ]
+        PromptTemplate.objects.bulk_create(new_prompts)
 
-        # Generate additional random prompts
-        for i in range(20 - created):
-            cat = random.choice(MORE_CATEGORIES)
-            title = f"Sample Prompt {i+1} - {cat}"
-            text = f"A {random.choice(['detailed','minimal','stylized'])} {cat.lower()} scene with {random.choice(MORE_TAGS)}, mood: {{mood}}."
-            p, _ = PromptTemplate.objects.get_or_create(
-                title=title,
-                defaults={
-                    'prompt_text': text,
-                    'description': f'Auto-generated sample prompt for {cat}',
-                    'category': cat_objs.get(cat),
-                    'variables': ['mood'],
-                    'is_public': True,
-                }
-            )
-            # add some tags
-            for t in random.sample(MORE_TAGS, k=2):
-                tag_objs[t].prompts.add(p)
+        # Attach tags through the M2M through table in one bulk insert
+        # (UUID pks are assigned locally, so bulk_create keeps the ids).
+        tags_by_title = {d['title']: d['tags'] for d in desired}
+        through = PromptTemplate.tags.through
+        through.objects.bulk_create(
+            [
+                through(prompttemplate_id=p.id, tag_id=tag_objs[t].id)
+                for p in new_prompts
+                for t in tags_by_title[p.title]
+            ],
+            ignore_conflicts=True
+        )
 
         self.stdout.write(self.style.SUCCESS('Seeded prompt_library with sample data'))
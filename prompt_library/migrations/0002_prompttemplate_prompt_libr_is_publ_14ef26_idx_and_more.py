@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-08-30 10:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prompttemplate',
+            index=models.Index(fields=['is_public', '-created_at'], name='prompt_libr_is_publ_14ef26_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prompttemplate',
+            index=models.Index(fields=['category', '-created_at'], name='prompt_libr_categor_18a904_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prompttemplate',
+            index=models.Index(fields=['author', '-created_at'], name='prompt_libr_author__b99cd2_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-08-30 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0002_prompttemplate_prompt_libr_is_publ_14ef26_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='prompttemplate',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='userpromptlibrary',
+            name='saved_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
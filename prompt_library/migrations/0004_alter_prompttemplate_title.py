@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-08-30 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0003_alter_prompttemplate_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='prompttemplate',
+            name='title',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-08-30 10:56
+
+from django.db import migrations, models
+
+
+def backfill_tag_names(apps, schema_editor):
+    PromptTemplate = apps.get_model('prompt_library', 'PromptTemplate')
+    templates = list(PromptTemplate.objects.prefetch_related('tags'))
+    for template in templates:
+        template.tag_names = [t.name for t in template.tags.all()]
+    PromptTemplate.objects.bulk_update(templates, ['tag_names'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0004_alter_prompttemplate_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prompttemplate',
+            name='tag_names',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(backfill_tag_names, migrations.RunPython.noop),
+    ]
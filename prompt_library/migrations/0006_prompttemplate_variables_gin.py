@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_variables_gin_index(apps, schema_editor):
+    # GIN indexes only exist on Postgres; SQLite (local dev) just skips this.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS prompt_library_variables_gin "
+        "ON prompt_library_prompttemplate USING GIN (variables)"
+    )
+
+
+def drop_variables_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS prompt_library_variables_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0005_prompttemplate_tag_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_variables_gin_index, drop_variables_gin_index),
+    ]
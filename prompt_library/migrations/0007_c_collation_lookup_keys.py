@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def apply_c_collation(apps, schema_editor):
+    # "C" collation is a Postgres concept; SQLite (local dev) keeps its
+    # default BINARY collation, which already compares bytewise.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE prompt_library_tag '
+        'ALTER COLUMN name TYPE varchar(50) COLLATE "C"'
+    )
+    schema_editor.execute(
+        'ALTER TABLE prompt_library_category '
+        'ALTER COLUMN slug TYPE varchar(100) COLLATE "C"'
+    )
+
+
+def drop_c_collation(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE prompt_library_tag ALTER COLUMN name TYPE varchar(50)'
+    )
+    schema_editor.execute(
+        'ALTER TABLE prompt_library_category ALTER COLUMN slug TYPE varchar(100)'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0006_prompttemplate_variables_gin'),
+    ]
+
+    operations = [
+        migrations.RunPython(apply_c_collation, drop_c_collation),
+    ]
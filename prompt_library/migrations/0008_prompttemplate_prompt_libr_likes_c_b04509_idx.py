@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-08-30 11:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0007_c_collation_lookup_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prompttemplate',
+            index=models.Index(fields=['-likes_count', 'id'], name='prompt_libr_likes_c_b04509_idx'),
+        ),
+    ]
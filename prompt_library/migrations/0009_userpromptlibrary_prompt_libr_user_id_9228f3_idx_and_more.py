@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-08-30 11:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompt_library', '0008_prompttemplate_prompt_libr_likes_c_b04509_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userpromptlibrary',
+            index=models.Index(fields=['user', 'is_favorite'], name='prompt_libr_user_id_9228f3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userpromptlibrary',
+            index=models.Index(fields=['prompt', 'is_favorite'], name='prompt_libr_prompt__426215_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from django.conf import settings
-from django.utils import timezone
 import uuid
 
 
@@ -30,34 +32,89 @@ class Tag(models.Model):
 
 class PromptTemplate(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    title = models.CharField(max_length=200)
+    # Indexed: the seeder and lookups resolve templates by title.
+    title = models.CharField(max_length=200, db_index=True)
     prompt_text = models.TextField()
     description = models.TextField(blank=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='prompts')
     tags = models.ManyToManyField(Tag, related_name='prompts', blank=True)
     variables = models.JSONField(default=list, blank=True)
+    # Denormalized copy of tags' names, maintained by the m2m_changed
+    # receiver below; lets list endpoints skip the M2M join entirely.
+    # JSONField rather than a Postgres ArrayField so SQLite dev works too.
+    tag_names = models.JSONField(default=list, blank=True, editable=False)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_prompts')
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     likes_count = models.PositiveIntegerField(default=0)
     is_public = models.BooleanField(default=True)
 
     class Meta:
         ordering = ['-created_at']
+        # The viewset lists by -created_at filtered on visibility, category
+        # and author; composite indexes let those pages come straight off a
+        # B-tree range scan instead of a sort.
+        indexes = [
+            models.Index(fields=['is_public', '-created_at']),
+            models.Index(fields=['category', '-created_at']),
+            models.Index(fields=['author', '-created_at']),
+            # ?ordering=-likes_count pages (with id as tiebreaker) seek this
+            # index instead of sorting the whole table per page.
+            models.Index(fields=['-likes_count', 'id']),
+        ]
 
     def __str__(self):
         return self.title
 
+    def like(self):
+        """Bump likes_count with a single atomic UPDATE (no lost updates)."""
+        type(self).objects.filter(pk=self.pk).update(likes_count=models.F('likes_count') + 1)
+
+    def unlike(self):
+        """Drop likes_count atomically, clamped at zero."""
+        type(self).objects.filter(pk=self.pk).update(
+            likes_count=Greatest(models.F('likes_count') - 1, 0)
+        )
+
 
 class UserPromptLibrary(models.Model):
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='prompt_library')
     prompt = models.ForeignKey(PromptTemplate, on_delete=models.CASCADE, related_name='saved_by')
-    saved_at = models.DateTimeField(default=timezone.now)
+    saved_at = models.DateTimeField(auto_now_add=True, db_index=True)
     is_favorite = models.BooleanField(default=False)
 
     class Meta:
         unique_together = [('user', 'prompt')]
         ordering = ['-saved_at']
+        # favorites filters (user, is_favorite); the like toggle filters
+        # (prompt, is_favorite) — both become direct index range scans.
+        indexes = [
+            models.Index(fields=['user', 'is_favorite']),
+            models.Index(fields=['prompt', 'is_favorite']),
+        ]
 
     def __str__(self):
-        return f"{self.user} -> {self.prompt.title}"
+        # Avoid lazy FK loads: repr is called from admin lists and logging,
+        # where an unfetched user/prompt would cost two SELECTs per row.
+        cached = self._state.fields_cache
+        user = cached['user'] if 'user' in cached else f"user#{self.user_id}"
+        title = cached['prompt'].title if 'prompt' in cached else f"prompt#{self.prompt_id}"
+        return f"{user} -> {title}"
+
+
+def _refresh_tag_names(prompt):
+    prompt.tag_names = list(prompt.tags.values_list('name', flat=True))
+    prompt.save(update_fields=['tag_names'])
+
+
+@receiver(m2m_changed, sender=PromptTemplate.tags.through)
+def _sync_prompt_tag_names(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep the denormalized tag_names column in step with the M2M."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        _refresh_tag_names(instance)
+    else:
+        # tag.prompts.add/remove(...): refresh each affected template
+        for prompt in PromptTemplate.objects.filter(pk__in=pk_set or ()):
+            _refresh_tag_names(prompt)
@@ -8,8 +8,9 @@ class IsAuthorOrReadOnly(BasePermission):
         # Allow safe methods for any request
         if request.method in SAFE_METHODS:
             return True
-        # Otherwise ensure the object has an author and matches the request user
-        try:
-            return obj.author is not None and obj.author == request.user
-        except Exception:
+        # Anonymous users can never be the author; bail before touching obj
+        if not request.user.is_authenticated:
             return False
+        # Compare raw FK ids: no try/except, and no lazy fetch of obj.author
+        author_id = getattr(obj, 'author_id', None)
+        return author_id is not None and author_id == request.user.id
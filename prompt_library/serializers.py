@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import PromptTemplate, Category, Tag, UserPromptLibrary
 
@@ -28,27 +29,75 @@ class PromptTemplateSerializer(serializers.ModelSerializer):
         # include author_id so the declared field matches the serializer fields
         fields = ['id', 'title', 'prompt_text', 'description', 'category', 'category_id', 'tags', 'tag_names', 'variables', 'author', 'author_id', 'created_at', 'likes_count', 'is_public']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Attach the joins/prefetches this serializer reads per instance.
+
+        The nested category, the author string and the tag list otherwise
+        each cost a query per serialized row; viewsets should pass their
+        queryset through here.
+        """
+        return queryset.select_related('category', 'author').prefetch_related('tags')
+
+    def _sync_tags(self, prompt, names):
+        """Resolve tag names to rows and attach them with three queries total.
+
+        bulk_create(ignore_conflicts=True) inserts any missing tags, one
+        filter fetches them all back, and tags.set() replaces the M2M rows —
+        instead of a get_or_create plus an INSERT per name. Resolved tags
+        are remembered in the request-scoped ``tag_cache`` from the
+        serializer context, so a batch create touching the same tags only
+        resolves each unique name once.
+        """
+        tag_cache = self.context.setdefault('tag_cache', {})
+        missing = [n for n in names if n not in tag_cache]
+        if missing:
+            Tag.objects.bulk_create([Tag(name=n) for n in missing], ignore_conflicts=True)
+            for tag in Tag.objects.filter(name__in=missing):
+                tag_cache[tag.name] = tag
+        prompt.tags.set([tag_cache[n] for n in names if n in tag_cache])
+
+    @transaction.atomic
     def create(self, validated_data):
         tags = validated_data.pop('tag_names', [])
         prompt = PromptTemplate.objects.create(**validated_data)
-        for t in tags:
-            tag_obj, _ = Tag.objects.get_or_create(name=t)
-            prompt.tags.add(tag_obj)
+        if tags:
+            self._sync_tags(prompt, tags)
         return prompt
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         tags = validated_data.pop('tag_names', None)
         for attr, val in validated_data.items():
             setattr(instance, attr, val)
         instance.save()
         if tags is not None:
-            instance.tags.clear()
-            for t in tags:
-                tag_obj, _ = Tag.objects.get_or_create(name=t)
-                instance.tags.add(tag_obj)
+            self._sync_tags(instance, tags)
         return instance
 
 
+class PromptTemplateListSerializer(serializers.ModelSerializer):
+    """Trimmed serializer for list pages.
+
+    Omits the kilobyte-scale prompt_text/description TextFields so list
+    responses (paired with .defer() on the queryset) stay small, and reads
+    tag names from the denormalized tag_names column so listing needs no
+    M2M prefetch at all; the detail endpoint returns the full
+    PromptTemplateSerializer payload.
+    """
+    category = CategorySerializer(read_only=True)
+    author = serializers.StringRelatedField(read_only=True)
+    author_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = PromptTemplate
+        fields = ['id', 'title', 'category', 'tag_names', 'author', 'author_id', 'created_at', 'likes_count', 'is_public']
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('category', 'author')
+
+
 class UserPromptLibrarySerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     prompt = PromptTemplateSerializer(read_only=True)
@@ -7,7 +7,10 @@ from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import PromptTemplate, Category, Tag, UserPromptLibrary
-from .serializers import PromptTemplateSerializer, CategorySerializer, TagSerializer, UserPromptLibrarySerializer
+from .serializers import (
+    PromptTemplateSerializer, PromptTemplateListSerializer,
+    CategorySerializer, TagSerializer, UserPromptLibrarySerializer
+)
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAdminUser
@@ -15,9 +18,21 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+import hashlib
+import json
+import re
 import requests
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class PromptTemplateViewSet(viewsets.ModelViewSet):
@@ -27,41 +42,73 @@ class PromptTemplateViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category__slug', 'tags__name', 'is_public']
-    search_fields = ['title', 'prompt_text', 'description', 'tags__name']
+    # Search the denormalized tag_names column instead of tags__name: an M2M
+    # path makes SearchFilter wrap the query in SELECT DISTINCT (and the
+    # paginator COUNT over it); a local column needs neither join nor DISTINCT.
+    search_fields = ['title', 'prompt_text', 'description', 'tag_names']
     ordering_fields = ['created_at', 'likes_count']
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PromptTemplateListSerializer
+        return PromptTemplateSerializer
+
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = self.get_serializer_class().setup_eager_loading(super().get_queryset())
+        # List pages don't render the large text columns; skip fetching them.
+        if self.action == 'list':
+            qs = qs.defer('prompt_text', 'description')
         # Only public prompts for anonymous users
         if not self.request.user.is_authenticated:
             return qs.filter(is_public=True)
         return qs
 
+    def get_object(self):
+        # like/unlike only read the pk and counter; skip the category/author
+        # joins and tag prefetch the serializer-oriented queryset carries.
+        if self.action in ('like', 'unlike'):
+            obj = get_object_or_404(
+                PromptTemplate.objects.only('id', 'likes_count'),
+                pk=self.kwargs[self.lookup_field],
+            )
+            self.check_object_permissions(self.request, obj)
+            return obj
+        return super().get_object()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Request-scoped name -> Tag map shared by every serializer built for
+        # this request, so batch creates resolve each tag name only once.
+        context['tag_cache'] = {}
+        return context
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def like(self, request, pk=None):
         prompt = self.get_object()
-        # Simple toggle: record in UserPromptLibrary as favorite and increment likes_count
+        # Record the favorite, then bump the counter atomically in the DB —
+        # but only when this request actually changed the favorite state, so
+        # repeat likes can't inflate the count.
         upl, created = UserPromptLibrary.objects.get_or_create(user=request.user, prompt=prompt)
-        upl.is_favorite = True
-        upl.save()
-        prompt.likes_count = prompt.saved_by.filter(is_favorite=True).count()
-        prompt.save(update_fields=['likes_count'])
+        if created or not upl.is_favorite:
+            upl.is_favorite = True
+            upl.save(update_fields=['is_favorite'])
+            prompt.like()
+            prompt.refresh_from_db(fields=['likes_count'])
+        # already favorited: idempotent retry, return the counter we fetched
         return Response({'status': 'liked', 'likes_count': prompt.likes_count})
 
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def unlike(self, request, pk=None):
         prompt = self.get_object()
-        try:
-            upl = UserPromptLibrary.objects.get(user=request.user, prompt=prompt)
-            upl.is_favorite = False
-            upl.save()
-        except UserPromptLibrary.DoesNotExist:
-            pass
-        prompt.likes_count = prompt.saved_by.filter(is_favorite=True).count()
-        prompt.save(update_fields=['likes_count'])
+        changed = UserPromptLibrary.objects.filter(
+            user=request.user, prompt=prompt, is_favorite=True
+        ).update(is_favorite=False)
+        if changed:
+            prompt.unlike()
+            prompt.refresh_from_db(fields=['likes_count'])
         return Response({'status': 'unliked', 'likes_count': prompt.likes_count})
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
@@ -97,26 +144,63 @@ class PromptTemplateViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(data=payload)
         serializer.is_valid(raise_exception=True)
-        # save with author
-        prompt = serializer.save(author=request.user)
-        out = self.get_serializer(prompt)
-        return Response(out.data, status=status.HTTP_201_CREATED)
+        # save with author; serializer.data re-renders from the saved
+        # instance, so no second serializer is needed
+        serializer.save(author=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+# Categories and tags are a few dozen nearly-static rows fetched on every
+# frontend render; cache the unfiltered list payloads briefly and invalidate
+# on any write.
+CATEGORY_LIST_CACHE_KEY = 'prompt_library:categories:v1'
+TAG_LIST_CACHE_KEY = 'prompt_library:tags:v1'
+LIST_CACHE_TTL = 300
+
 
+class _CachedListMixin:
+    """Serve the unfiltered list action from the cache."""
+    list_cache_key = None
 
-class CategoryViewSet(viewsets.ModelViewSet):
+    def list(self, request, *args, **kwargs):
+        # Search/ordering params change the payload; only cache the plain list.
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        data = cache.get(self.list_cache_key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(self.list_cache_key, response.data, LIST_CACHE_TTL)
+            return response
+        return Response(data)
+
+
+class CategoryViewSet(_CachedListMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
+    list_cache_key = CATEGORY_LIST_CACHE_KEY
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(_CachedListMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
+    list_cache_key = TAG_LIST_CACHE_KEY
+
+
+@receiver([post_save, post_delete], sender=Category)
+def _invalidate_category_list_cache(sender, **kwargs):
+    cache.delete(CATEGORY_LIST_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def _invalidate_tag_list_cache(sender, **kwargs):
+    cache.delete(TAG_LIST_CACHE_KEY)
 
 
 class UserPromptLibraryViewSet(viewsets.ModelViewSet):
@@ -124,7 +208,14 @@ class UserPromptLibraryViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return UserPromptLibrary.objects.filter(user=self.request.user).select_related('prompt')
+        # The nested PromptTemplateSerializer renders the prompt's category,
+        # author and tags, so join/prefetch those too or each library row
+        # costs three extra queries.
+        return (
+            UserPromptLibrary.objects.filter(user=self.request.user)
+            .select_related('user', 'prompt__category', 'prompt__author')
+            .prefetch_related('prompt__tags')
+        )
 
     def perform_create(self, serializer):
         # kept for compatibility - not used when create() is overridden below
@@ -154,7 +245,7 @@ class UserPromptLibraryViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def favorites(self, request):
         """Return user's favorite (liked) prompts."""
-        qs = UserPromptLibrary.objects.filter(user=request.user, is_favorite=True).select_related('prompt')
+        qs = self.get_queryset().filter(is_favorite=True)
         page = self.paginate_queryset(qs)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -163,6 +254,72 @@ class UserPromptLibraryViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+# How long generated prompt variations are reused for identical inputs.
+GEMINI_CACHE_TTL = 600
+
+# Shared keep-alive session for the Gemini API: reusing pooled TLS
+# connections saves the handshake (~100-300ms) on every call, and transient
+# upstream errors get a couple of quick retries.
+_GEMINI_SESSION = requests.Session()
+_GEMINI_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+# Gemini endpoint configuration, resolved once at import; settings are fixed
+# for the process lifetime, so the per-request getattr chains were wasted work.
+_GENERATIVE_API_BASE = getattr(settings, 'GENERATIVE_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
+_GEMINI_MODEL = getattr(settings, 'GEMINI_MODEL', 'gemini-pro')
+_GEMINI_AUTH_METHOD = getattr(settings, 'GEMINI_API_AUTH_METHOD', 'key')
+_GEMINI_API_KEY = getattr(settings, 'GEMINI_API_KEY', None) or getattr(settings, 'NEXT_PUBLIC_GEMINI_API_KEY', None)
+_GEMINI_URL = f"{_GENERATIVE_API_BASE.rstrip('/')}/models/{_GEMINI_MODEL}:generateContent"
+
+# Trailing aspect-ratio hint like "[16:9]" or "16:9"; compiled once rather
+# than per parsed variation.
+_ASPECT_RE = re.compile(r"\[?(\d+:\d+)\]?$")
+
+
+def _parse_variation(text):
+    """Split a generated variation into {title, prompt, aspect}.
+
+    Handles the recommended model output format: optional short title line
+    (or "Title - prompt" separator) and an optional trailing aspect hint.
+    """
+    t = (text or '').strip()
+    title = None
+    aspect = None
+
+    m = _ASPECT_RE.search(t)
+    if m:
+        aspect = m.group(1)
+        # remove the trailing aspect token
+        t = t[:m.start()].rstrip()
+
+    # if content has multiple lines, and first line is short, treat that as title
+    lines = [ln.strip() for ln in t.splitlines() if ln.strip()]
+    if len(lines) >= 2 and len(lines[0]) <= 40:
+        title = lines[0]
+        prompt_text = ' '.join(lines[1:]).strip()
+    else:
+        # If the model included a separator like ' - ' after a short title, split it
+        if ' - ' in t and len(t.split(' - ', 1)[0]) <= 30:
+            parts = t.split(' - ', 1)
+            title = parts[0].strip()
+            prompt_text = parts[1].strip()
+        else:
+            # fallback: no explicit title, use whole text as prompt
+            prompt_text = t
+            # derive a short title from the first 3-6 words
+            words = prompt_text.split()
+            if len(words) > 3:
+                title = ' '.join(words[:4])
+            elif words:
+                title = ' '.join(words[:min(3, len(words))])
+
+    return {'title': title, 'prompt': prompt_text, 'aspect': aspect}
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class GeneratePromptView(APIView):
     # Allow unauthenticated access and disable session auth for this endpoint so
@@ -176,6 +333,90 @@ class GeneratePromptView(APIView):
     Returns: { variations: [str, str, str], metadata: {...} }
     """
 
+    def _call_gemini(self, url, api_key, headers, auth_method, payload):
+        """Issue one generateContent call and return (texts, error_detail).
+
+        texts is the list of candidate strings extracted from the response;
+        error_detail is non-empty only when the call failed (exception or
+        non-200), so callers can surface it in fallback metadata.
+        """
+        try:
+            if auth_method == 'key':
+                resp = _GEMINI_SESSION.post(f"{url}?key={api_key}", json=payload, headers=headers, timeout=20)
+            else:
+                bearer_headers = dict(headers)
+                bearer_headers['Authorization'] = f'Bearer {api_key}'
+                resp = _GEMINI_SESSION.post(url, json=payload, headers=bearer_headers, timeout=20)
+        except requests.RequestException as e:
+            self.logger.error("Gemini request exception: %s", str(e))
+            return [], str(e)
+
+        if resp.status_code != 200:
+            try:
+                body = resp.text
+            except Exception:
+                body = ''
+            self.logger.warning("Gemini non-200 (%s): %s", resp.status_code, body[:300])
+            return [], body or f'HTTP {resp.status_code}'
+
+        # orjson parses the multi-KB response bodies several times faster
+        # than stdlib json; fall back to resp.json() when it's not installed.
+        try:
+            j = orjson.loads(resp.content) if orjson is not None else resp.json()
+        except ValueError:
+            j = None
+
+        # Single-pass extraction via .get() chains; one try/except around the
+        # whole walk replaces the per-level isinstance ladders, so a malformed
+        # response just yields no texts instead of costing checks on every node.
+        # A single call never contributes more than three variations, so stop
+        # walking candidates once that many texts are in hand.
+        limit = 3
+        found = []
+        try:
+            # candidates -> content -> parts -> text
+            for cand in (j or {}).get('candidates') or []:
+                if len(found) >= limit:
+                    break
+                content = cand.get('content') or cand.get('message') or {}
+                parts = (content.get('parts') or []) if isinstance(content, dict) else []
+                if parts:
+                    for p in parts:
+                        txt = p.get('text') if isinstance(p, dict) else None
+                        if txt:
+                            found.append(txt.strip())
+                        if len(found) >= limit:
+                            break
+                else:
+                    # some responses may include 'text' directly
+                    txt = cand.get('text') or cand.get('output')
+                    if isinstance(txt, str) and txt.strip():
+                        found.append(txt.strip())
+
+            # fallback: also inspect top-level 'output' or nested text fields
+            if not found:
+                out = (j or {}).get('output')
+                if isinstance(out, list):
+                    for o in out:
+                        if len(found) >= limit:
+                            break
+                        if isinstance(o, dict):
+                            for part in (o.get('content') or {}).get('parts') or []:
+                                txt = part.get('text') if isinstance(part, dict) else None
+                                if txt:
+                                    found.append(txt.strip())
+                                if len(found) >= limit:
+                                    break
+                        elif isinstance(o, str):
+                            found.append(o.strip())
+                elif isinstance(out, str):
+                    found.append(out.strip())
+        except (AttributeError, KeyError, TypeError):
+            self.logger.warning("Unrecognized Gemini response shape; no texts extracted")
+            found = []
+
+        return found, ''
+
     def post(self, request):
         data = request.data or {}
         user_input = data.get('userInput', '')
@@ -189,15 +430,37 @@ class GeneratePromptView(APIView):
         if not user_input or not user_input.strip():
             return Response({'error': 'userInput required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Simple rate limiting: 60 requests per minute per user or IP
+        # Identical generation requests within the TTL are served straight
+        # from the cache: no Gemini round-trips (up to 3 x 20s worst case),
+        # no API spend, and they don't count against the rate limit.
+        cache_key = 'gemini:' + hashlib.sha256(json.dumps({
+            'userInput': user_input.strip(),
+            'style': style,
+            'mood': mood,
+            'artMovement': art_movement,
+            'quality': quality,
+            'detailLevel': detail,
+            'advancedOptions': advanced,
+        }, sort_keys=True, default=str).encode()).hexdigest()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
+
+        # Simple rate limiting: 60 requests per minute per user or IP.
+        # add() + incr() is atomic on shared backends (Redis/memcached), so
+        # concurrent requests can't race a get/set pair past the limit.
         identifier = f"gemini_rl_{request.user.id if request.user.is_authenticated else request.META.get('REMOTE_ADDR')}"
-        count = cache.get(identifier, 0)
-        if count >= 60:
+        cache.add(identifier, 0, timeout=60)
+        try:
+            count = cache.incr(identifier)
+        except ValueError:
+            # key expired between add and incr; start a fresh window
+            cache.add(identifier, 1, timeout=60)
+            count = 1
+        if count > 60:
             return Response({'error': 'Rate limit exceeded'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
-        cache.set(identifier, count + 1, timeout=60)
 
-        api_key = getattr(settings, 'GEMINI_API_KEY', None) or getattr(settings, 'NEXT_PUBLIC_GEMINI_API_KEY', None)
-        if not api_key:
+        if not _GEMINI_API_KEY:
             return Response({'error': 'Gemini API key not configured on server'}, status=status.HTTP_501_NOT_IMPLEMENTED)
 
         # Build a stronger system/user prompt for Gemini with clear guidelines and examples
@@ -225,24 +488,19 @@ class GeneratePromptView(APIView):
             "and a trailing bracketed hint for aspect ratio like [16:9] or [1:1] if relevant. Return only the three prompt texts."
         )
 
-        # Call configured generative API endpoint (use Generative Language API format)
-        # Default to Google's generative language v1beta endpoint unless overridden
-        base = getattr(settings, 'GENERATIVE_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
-        model = getattr(settings, 'GEMINI_MODEL', 'gemini-pro')
-        auth_method = getattr(settings, 'GEMINI_API_AUTH_METHOD', 'key')
-
-        url = f"{base.rstrip('/')}/models/{model}:generateContent"
-
         headers = {'Content-Type': 'application/json'}
 
-        # We'll attempt up to 3 generation calls with slightly different temperatures
+        # Three generation calls with slightly different temperatures. The
+        # calls are independent and network-bound, so fan them out on a small
+        # thread pool: wall time is the slowest call (~20s worst case)
+        # instead of the sum of all three (~60s).
         temps = [0.7, 0.9, 1.1]
         max_tokens = 1200
         variations = []
         gemini_body = None
 
-        for temp in temps:
-            payload = {
+        payloads = [
+            {
                 "contents": [{
                     "parts": [{"text": f"{system}\n\n{user_msg}"}]
                 }],
@@ -252,76 +510,31 @@ class GeneratePromptView(APIView):
                     "topP": 0.95
                 }
             }
-
-            try:
-                if auth_method == 'key':
-                    resp = requests.post(f"{url}?key={api_key}", json=payload, headers=headers, timeout=20)
-                else:
-                    headers['Authorization'] = f'Bearer {api_key}'
-                    resp = requests.post(url, json=payload, headers=headers, timeout=20)
-            except requests.RequestException as e:
-                self.logger.error("Gemini request exception: %s", str(e))
-                gemini_body = str(e)
-                resp = None
-
-            if resp is None:
+            for temp in temps
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            futures = [
+                executor.submit(self._call_gemini, _GEMINI_URL, _GEMINI_API_KEY, headers, _GEMINI_AUTH_METHOD, payload)
+                for payload in payloads
+            ]
+            # Consume in submit order so results stay deterministic per run.
+            results = [f.result() for f in futures]
+
+        seen = set()
+        for found, error in results:
+            if error:
+                gemini_body = error
                 continue
-
             gemini_body = ''
-            if resp.status_code != 200:
-                try:
-                    gemini_body = resp.text
-                except Exception:
-                    gemini_body = ''
-                self.logger.warning("Gemini non-200 (%s): %s", resp.status_code, gemini_body[:300])
-                # try next temperature
-                continue
-
-            try:
-                j = resp.json()
-            except ValueError:
-                j = None
 
-            # Parse the generative language response for candidate text parts
-            found = []
-            if isinstance(j, dict):
-                # candidates -> content -> parts -> text
-                for cand in j.get('candidates', []):
-                    content = cand.get('content') or cand.get('message') or {}
-                    parts = []
-                    if isinstance(content, dict):
-                        parts = content.get('parts') or []
-                    if parts:
-                        for p in parts:
-                            if isinstance(p, dict) and 'text' in p and p.get('text'):
-                                found.append(p.get('text').strip())
-                    else:
-                        # some responses may include 'text' directly
-                        txt = cand.get('text') or cand.get('output')
-                        if isinstance(txt, str) and txt.strip():
-                            found.append(txt.strip())
-
-                # fallback: also inspect top-level 'output' or nested text fields
-                if not found:
-                    if 'output' in j:
-                        out = j.get('output')
-                        if isinstance(out, list):
-                            for o in out:
-                                if isinstance(o, dict):
-                                    for part in o.get('content', {}).get('parts', []) if o.get('content') else []:
-                                        if isinstance(part, dict) and 'text' in part:
-                                            found.append(part.get('text').strip())
-                                elif isinstance(o, str):
-                                    found.append(o.strip())
-                        elif isinstance(out, str):
-                            found.append(out.strip())
-
-            # append unique, non-empty texts to variations
+            # append unique, non-empty texts to variations (set membership
+            # keeps dedup O(1) per candidate rather than scanning the list)
             for t in found:
-                if not t:
+                if not t or t in seen:
                     continue
-                if t not in variations:
-                    variations.append(t)
+                seen.add(t)
+                variations.append(t)
                 if len(variations) >= 3:
                     break
 
@@ -351,46 +564,13 @@ class GeneratePromptView(APIView):
         # Ensure we return three items (may be shorter)
         while len(variations) < 3:
             variations.append('')
-        # Attempt to parse structured variations (title, prompt, aspect) when model follows the recommended format
-        def parse_variation(text: str):
-            t = (text or '').strip()
-            title = None
-            aspect = None
-
-            # extract trailing aspect hint like [16:9] or (16:9)
-            import re
-            m = re.search(r"\[?(\d+:\d+)\]?$", t)
-            if m:
-                aspect = m.group(1)
-                # remove the trailing aspect token
-                t = re.sub(r"\s*\[?%s\]?\s*$" % re.escape(aspect), '', t).strip()
-
-            # if content has multiple lines, and first line is short, treat that as title
-            lines = [ln.strip() for ln in t.splitlines() if ln.strip()]
-            if len(lines) >= 2 and len(lines[0]) <= 40:
-                title = lines[0]
-                prompt_text = ' '.join(lines[1:]).strip()
-            else:
-                # If the model included a separator like ' - ' after a short title, split it
-                if ' - ' in t and len(t.split(' - ', 1)[0]) <= 30:
-                    parts = t.split(' - ', 1)
-                    title = parts[0].strip()
-                    prompt_text = parts[1].strip()
-                else:
-                    # fallback: no explicit title, use whole text as prompt
-                    prompt_text = t
-                    # derive a short title from the first 3-6 words
-                    words = [w for w in re.split(r"\s+", prompt_text) if w]
-                    if len(words) > 3:
-                        title = ' '.join(words[:4])
-                    elif words:
-                        title = ' '.join(words[:min(3, len(words))])
-
-            return {'title': title, 'prompt': prompt_text, 'aspect': aspect}
-
-        structured = [parse_variation(v) for v in variations]
-        metadata = {'model': model, 'timestamp': int(time.time())}
-        return Response({'variations': variations, 'structured_variations': structured, 'metadata': metadata})
+        structured = [_parse_variation(v) for v in variations]
+        metadata = {'model': _GEMINI_MODEL, 'timestamp': int(time.time())}
+        body = {'variations': variations, 'structured_variations': structured, 'metadata': metadata}
+        # Only real Gemini output is cached; the local-fallback branch above
+        # returns early so transient API failures aren't pinned for the TTL.
+        cache.set(cache_key, body, GEMINI_CACHE_TTL)
+        return Response(body)
 
 
 class GeneratePromptDiagnoseView(APIView):
@@ -402,12 +582,10 @@ class GeneratePromptDiagnoseView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        base = getattr(settings, 'GENERATIVE_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
-        model = getattr(settings, 'GEMINI_MODEL', 'gemini-pro')
-        auth_method = getattr(settings, 'GEMINI_API_AUTH_METHOD', 'key')
-        api_key = getattr(settings, 'GEMINI_API_KEY', None) or getattr(settings, 'NEXT_PUBLIC_GEMINI_API_KEY', None)
-
-        url = f"{base.rstrip('/')}/models/{model}:generateContent"
+        model = _GEMINI_MODEL
+        auth_method = _GEMINI_AUTH_METHOD
+        api_key = _GEMINI_API_KEY
+        url = _GEMINI_URL
         headers = {'Content-Type': 'application/json'}
         if auth_method == 'bearer':
             if api_key:
@@ -425,9 +603,9 @@ class GeneratePromptDiagnoseView(APIView):
 
         try:
             if auth_method == 'key' and api_key:
-                resp = requests.post(f"{url}?key={api_key}", json=payload, headers=headers, timeout=8)
+                resp = _GEMINI_SESSION.post(f"{url}?key={api_key}", json=payload, headers=headers, timeout=8)
             else:
-                resp = requests.post(url, json=payload, headers=headers, timeout=8)
+                resp = _GEMINI_SESSION.post(url, json=payload, headers=headers, timeout=8)
 
             status_code = getattr(resp, 'status_code', None)
             elapsed_ms = int(getattr(resp, 'elapsed', 0).total_seconds() * 1000) if getattr(resp, 'elapsed', None) else None